@@ -0,0 +1,42 @@
+"""add movie filter indexes
+
+Revision ID: 146b91d1719b
+Revises: dca6c940aed3
+Create Date: 2026-10-15 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '146b91d1719b'
+down_revision: Union[str, Sequence[str], None] = 'dca6c940aed3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # trigram indexes let Postgres serve ILIKE '%term%' filters without a seq scan
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_movies_title_trgm', 'movies', ['title'],
+        unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_movies_release_year', 'movies', ['release_year'], unique=False)
+    op.create_index(
+        'ix_genres_name_trgm', 'genres', ['name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_movie_ratings_movie_id', 'movie_ratings', ['movie_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_ratings_movie_id', table_name='movie_ratings')
+    op.drop_index('ix_genres_name_trgm', table_name='genres')
+    op.drop_index('ix_movies_release_year', table_name='movies')
+    op.drop_index('ix_movies_title_trgm', table_name='movies')
+    # pg_trgm is left installed; other objects in the database may rely on it
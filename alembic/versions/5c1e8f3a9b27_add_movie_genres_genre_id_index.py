@@ -0,0 +1,29 @@
+"""add movie_genres genre_id index
+
+Revision ID: 5c1e8f3a9b27
+Revises: 146b91d1719b
+Create Date: 2026-10-15 14:03:27.512906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8f3a9b27'
+down_revision: Union[str, Sequence[str], None] = '146b91d1719b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (movie_id, genre_id) primary key can't serve lookups by genre_id alone,
+    # which the genre filter and ON DELETE CASCADE from genres both do
+    op.create_index('ix_movie_genres_genre_id', 'movie_genres', ['genre_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_genres_genre_id', table_name='movie_genres')
@@ -0,0 +1,177 @@
+"""
+Two-tier cache for serialized GET responses.
+
+A small in-process TTL cache answers repeated requests without a network
+hop; Redis, shared by all workers, sits behind it. The local tier only
+sees invalidations made by its own process, so its TTL is kept short to
+bound how stale other workers can be.
+
+Writes invalidate a namespace by bumping its generation number, which is
+part of every key in it. A read that started before the write stores its
+response under the old generation, where nothing looks it up again, and
+entries from old generations simply expire.
+
+The Redis tier is enabled only when REDIS_URL is set. Every Redis failure
+is logged and treated as a cache miss, so the API keeps serving from the
+database when Redis is unavailable.
+"""
+from __future__ import annotations
+
+import functools
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from cachetools import TTLCache
+from fastapi.responses import Response
+from pydantic_core import to_json
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config.logging import get_logger
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_PREFIX = "movie-rating"
+# 0 disables the in-process tier
+LOCAL_CACHE_TTL_SECONDS = float(os.getenv("LOCAL_CACHE_TTL_SECONDS", "5"))
+LOCAL_CACHE_MAXSIZE = int(os.getenv("LOCAL_CACHE_MAXSIZE", "256"))
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    _redis: Redis | None = None
+    # only touched from the event loop thread, so no lock is needed
+    _local: TTLCache | None = None
+    # namespace generations when there is no Redis to hold them
+    _generations: dict[str, int] = {}
+
+    @classmethod
+    async def init(
+        cls,
+        url: str | None = REDIS_URL,
+        local_ttl: float = LOCAL_CACHE_TTL_SECONDS,
+    ) -> None:
+        if url:
+            cls._redis = Redis.from_url(url)
+        if local_ttl > 0:
+            cls._local = TTLCache(maxsize=LOCAL_CACHE_MAXSIZE, ttl=local_ttl)
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._redis is not None:
+            await cls._redis.aclose()
+            cls._redis = None
+        cls._local = None
+        cls._generations = {}
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return cls._redis is not None or cls._local is not None
+
+    @classmethod
+    async def generation(cls, namespace: str) -> int | None:
+        """
+        Return the current generation of `namespace`, or None if it can't be read.
+
+        The local tier keeps the Redis value for its TTL, so a write made by
+        another worker reaches this one's lookups within that time.
+        """
+        if cls._redis is None:
+            return cls._generations.get(namespace, 0)
+        gen_key = f"{CACHE_PREFIX}:{namespace}:gen"
+        if cls._local is not None:
+            gen = cls._local.get(gen_key)
+            if gen is not None:
+                return gen
+        try:
+            gen = int(await cls._redis.get(gen_key) or 0)
+        except RedisError:
+            logger.warning("cache.generation.failed", namespace=namespace, exc_info=True)
+            return None
+        if cls._local is not None:
+            cls._local[gen_key] = gen
+        return gen
+
+    @classmethod
+    async def get(cls, key: str) -> bytes | None:
+        if cls._local is not None:
+            body = cls._local.get(key)
+            if body is not None:
+                return body
+        if cls._redis is None:
+            return None
+        try:
+            body = await cls._redis.get(key)
+        except RedisError:
+            logger.warning("cache.get.failed", key=key, exc_info=True)
+            return None
+        if body is not None and cls._local is not None:
+            cls._local[key] = body
+        return body
+
+    @classmethod
+    async def set(cls, key: str, value: bytes, expire: int) -> None:
+        if cls._local is not None:
+            cls._local[key] = value
+        if cls._redis is None:
+            return
+        try:
+            await cls._redis.set(key, value, ex=expire)
+        except RedisError:
+            logger.warning("cache.set.failed", key=key, exc_info=True)
+
+    @classmethod
+    async def invalidate(cls, namespace: str) -> None:
+        """Move `namespace` to a new generation, so no response cached before now is served."""
+        if cls._redis is None:
+            cls._generations[namespace] = cls._generations.get(namespace, 0) + 1
+            return
+        gen_key = f"{CACHE_PREFIX}:{namespace}:gen"
+        try:
+            gen = await cls._redis.incr(gen_key)
+        except RedisError:
+            logger.warning("cache.invalidate.failed", namespace=namespace, exc_info=True)
+            return
+        if cls._local is not None:
+            cls._local[gen_key] = gen
+
+
+def cached(
+    namespace: str,
+    key_builder: Callable[..., str],
+    expire: int = CACHE_TTL_SECONDS,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Response]]]:
+    """
+    Cache the JSON body returned by an async route handler.
+
+    `key_builder` receives the handler's keyword arguments and returns the
+    part of the key that identifies the response within `namespace`; the
+    namespace's generation is added in front of it.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not ResponseCache.enabled():
+                return await func(*args, **kwargs)
+
+            # read before the handler runs, so a write that lands while it
+            # does leaves this response under the generation it replaced
+            gen = await ResponseCache.generation(namespace)
+            if gen is None:
+                return await func(*args, **kwargs)
+
+            key = f"{CACHE_PREFIX}:{namespace}:{gen}:{key_builder(**kwargs)}"
+            body = await ResponseCache.get(key)
+            if body is not None:
+                return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+            body = to_json(await func(*args, **kwargs))
+            await ResponseCache.set(key, body, expire)
+            return Response(body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+        return wrapper
+
+    return decorator
@@ -1,49 +1,244 @@
 """
 Logging configuration for Movie Rating System.
 
-This module sets up structured logging with appropriate levels and formats.
+This module sets up structured JSON logging: application code logs through
+structlog, and records from stdlib loggers (uvicorn, sqlalchemy, ...) are
+rendered by the same orjson-backed pipeline.
 """
+import atexit
+import copy
+import io
 import logging
+import queue
 import sys
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+import orjson
+import structlog
+
+
+def _orjson_dumps(obj: Any, default: Any = None) -> str:
+    # logging handlers expect str, orjson produces bytes
+    return orjson.dumps(obj, default=default).decode()
+
+
+def _add_record_timestamp(logger: Any, method_name: str, event_dict: dict) -> dict:
+    # foreign records are rendered on the listener thread, so stamp them with
+    # the time they were created rather than the time they are formatted
+    created = datetime.fromtimestamp(event_dict["_record"].created, tz=timezone.utc)
+    event_dict["timestamp"] = created.isoformat().replace("+00:00", "Z")
+    return event_dict
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    Enqueue records without rendering them.
+
+    The stock QueueHandler formats each record before enqueueing it, which
+    would run the JSON rendering on the calling thread and hand the
+    listener a pre-rendered string. Records stay in-process, so only the
+    message of stdlib records is merged here, while their args still hold
+    the values they had at the call; the JSON rendering is left to the
+    listener's handler.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog records carry their event dict in msg (wrap_for_formatter)
+        if not hasattr(record, "_logger"):
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = ()
+        return record
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that batches writes until it is flushed.
+
+    Rendered lines are held in memory and written to the stream in one go
+    by flush(), or as soon as `capacity` characters are pending. WARNING
+    and above are written out immediately so diagnostics are not held back.
+    """
+
+    def __init__(
+        self,
+        stream: io.TextIOBase | None = None,
+        flush_level: int = logging.WARNING,
+        capacity: int = 65536,
+    ) -> None:
+        super().__init__(stream)
+        self.flush_level = flush_level
+        self.capacity = capacity
+        self._pending: list[str] = []
+        self._pending_size = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator
+            self._pending.append(line)
+            self._pending_size += len(line)
+            if record.levelno >= self.flush_level or self._pending_size >= self.capacity:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:
+            if self._pending:
+                # drop the batch even if the write fails, so it can't pile up
+                batch = "".join(self._pending)
+                self._pending.clear()
+                self._pending_size = 0
+                self.stream.write(batch)
+            super().flush()
+
+
+class _FlushingQueueListener(QueueListener):
+    """
+    QueueListener that also flushes its handlers, on its own thread.
+
+    Output is flushed once `flush_interval` seconds have passed since the
+    first record after the previous flush, so a quiet period leaves
+    nothing held back and the thread sleeps until the next record.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.SimpleQueue,
+        *handlers: logging.Handler,
+        flush_interval: float,
+        respect_handler_level: bool = False,
+    ) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+        self._flush_due: float | None = None
+
+    def dequeue(self, block: bool) -> Any:
+        while True:
+            if self._flush_due is None:
+                record = self.queue.get(block)
+                self._flush_due = time.monotonic() + self.flush_interval
+                return record
+            remaining = self._flush_due - time.monotonic()
+            if remaining > 0:
+                try:
+                    return self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    pass
+            self._flush_due = None
+            for handler in self.handlers:
+                try:
+                    handler.flush()
+                except Exception:
+                    # as with emit(), a failing stream must not stop the listener
+                    pass
+
+
+LOG_FLUSH_INTERVAL_SECONDS = 0.25
+
+_listener: QueueListener | None = None
+_handler: logging.Handler | None = None
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains queued records before returning
+        _listener = None
+    if _handler is not None:
+        # at interpreter exit the stream may already be closed, e.g. when a
+        # test runner swapped in its own stdout
+        with suppress(ValueError, OSError):
+            _handler.flush()
+
 
 def setup_logging(level: str = "INFO") -> None:
     """
     Configure logging for the application.
-    
+
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
     # Convert string level to logging constant
     log_level = getattr(logging, level.upper(), logging.INFO)
-    
+
+    # Processors shared by structlog and plain stdlib records
+    shared_processors = [
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+    ]
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            *shared_processors,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            # exc_info=True means "the exception being handled", which only
+            # resolves on the calling thread, not on the queue listener
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[*shared_processors, _add_record_timestamp],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
+        ],
+    )
+    # Batched so INFO lines are not a write() syscall each; the listener
+    # flushes it periodically and on shutdown
+    global _handler, _listener
+    handler = _BufferedStreamHandler(sys.stdout)
+    handler.setFormatter(formatter)
+
+    # Callers only enqueue; rendering, writing and flushing stdout all happen
+    # on the listener thread, so request handlers never wait on the stream lock
+    _stop_listener()
+    _handler = handler
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = _FlushingQueueListener(
+        log_queue,
+        handler,
+        flush_interval=LOG_FLUSH_INTERVAL_SECONDS,
+        respect_handler_level=True,
+    )
+    _listener.start()
+
     # Configure root logger
     logging.basicConfig(
         level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ],
+        handlers=[_RecordQueueHandler(log_queue)],
         force=True  # Override any existing configuration
     )
-    
+
     # Set specific loggers to appropriate levels
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn").setLevel(logging.INFO)
 
 
-def get_logger(name: str) -> logging.Logger:
+atexit.register(_stop_listener)
+
+
+def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """
     Get a logger instance for a module.
-    
+
     Args:
         name: Logger name (usually __name__)
-        
+
     Returns:
-        Configured logger instance
+        Configured structlog logger instance
     """
-    return logging.getLogger(name)
-
+    return structlog.get_logger(name)
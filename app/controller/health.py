@@ -1,14 +1,14 @@
 from fastapi import APIRouter
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.controller.deps import get_db
 router = APIRouter()
 
 @router.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 @router.get("/health/db")
-def health_db(db: Session = Depends(get_db)):
+async def health_db(db: AsyncSession = Depends(get_db)):
     # Just ensures the dependency resolves and session opens
     return {"status": "ok", "db": "session_created"}
\ No newline at end of file
@@ -1,20 +1,49 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import traceback
 import logging
 
+from app.cache.response_cache import ResponseCache
 from app.controller.api_v1 import api_router
 from app.controller.health import router as health_router
 from app.config.logging import setup_logging
 from app.exceptions.api_exceptions import APIError
+from app.middleware.logging import AccessLogMiddleware
+
+
+class _LazyDict:
+    """Defers copying a mapping into a dict until the log record is formatted."""
+
+    __slots__ = ("_mapping",)
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+    def __str__(self) -> str:
+        return str(dict(self._mapping))
+
 
 # Setup logging configuration
 setup_logging(level="INFO")
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Movie Rating System")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ResponseCache.init()
+    yield
+    await ResponseCache.close()
+
+
+app = FastAPI(
+    title="Movie Rating System",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -25,10 +54,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One structured log line per request (method, path, status, latency)
+app.add_middleware(AccessLogMiddleware)
+
 
 @app.exception_handler(APIError)
 def api_error_handler(request: Request, exc: APIError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.code,
         content={
             "status": "failure",
@@ -40,11 +72,11 @@ def api_error_handler(request: Request, exc: APIError):
 @app.exception_handler(RequestValidationError)
 def validation_error_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors and return consistent error format."""
-    logger.warning(f"Validation error: {exc.errors()}")
     errors = exc.errors()
+    logger.warning("Validation error: %s", errors)
     # Extract first error message for simplicity
     error_msg = errors[0]["msg"] if errors else "Validation error"
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "status": "failure",
@@ -58,15 +90,17 @@ def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions with detailed logging."""
     error_msg = str(exc)
     logger.error(
-        f"Unhandled exception in {request.url.path}: {error_msg}\n"
-        f"Method: {request.method}\n"
-        f"Headers: {dict(request.headers)}\n"
-        f"Query params: {dict(request.query_params)}",
+        "Unhandled exception in %s: %s\nMethod: %s\nHeaders: %s\nQuery params: %s",
+        request.url.path,
+        error_msg,
+        request.method,
+        _LazyDict(request.headers),
+        _LazyDict(request.query_params),
         exc_info=True
     )
     import sys
     traceback.print_exc(file=sys.stderr)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "status": "failure",
@@ -0,0 +1,47 @@
+"""
+Access logging for every HTTP request.
+
+Written as a plain ASGI middleware rather than BaseHTTPMiddleware so the
+response body (including StreamingResponse exports) passes straight
+through without an extra task and memory stream per request.
+"""
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.logging import get_logger
+
+logger = get_logger("movie_rating.access")
+
+
+class AccessLogMiddleware:
+    """Log method, path, status and latency once each request completes."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        t0 = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            logger.info(
+                "req",
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                latency_us=(time.perf_counter_ns() - t0) // 1000,
+            )
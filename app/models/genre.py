@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text
 
 from app.db.base import Base
 
@@ -13,6 +13,15 @@ class Genre(Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    __table_args__ = (
+        Index(
+            "ix_genres_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     movies: Mapped[list["Movie"]] = relationship(
         secondary="movie_genres",
         back_populates="genres",
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -25,11 +25,26 @@ class Movie(Base):
         nullable=False,
     )
 
+    __table_args__ = (
+        Index(
+            "ix_movies_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("ix_movies_release_year", "release_year"),
+    )
+
     director: Mapped["Director"] = relationship(back_populates="movies")
 
     genres: Mapped[list["Genre"]] = relationship(
         secondary="movie_genres",
         back_populates="movies",
+        # same order as the genre names in the list view
+        order_by="Genre.id",
+        # movie_genres rows go with the movie via ON DELETE CASCADE,
+        # so deleting a movie need not load its genres first
+        passive_deletes=True,
     )
 
     ratings: Mapped[list["MovieRating"]] = relationship(
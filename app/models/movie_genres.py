@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, Table
 
 from app.db.base import Base
 
@@ -7,4 +7,6 @@ movie_genres = Table(
     Base.metadata,
     Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
     Column("genre_id", Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True),
+    # the primary key leads with movie_id; genre filters and genre deletes look up by genre_id
+    Index("ix_movie_genres_genre_id", "genre_id"),
 )
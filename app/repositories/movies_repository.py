@@ -1,135 +1,335 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
 
-from sqlalchemy import select, func, delete, and_
-from sqlalchemy.orm import Session, selectinload, joinedload
+from cachetools import TTLCache
+from sqlalchemy import Row, bindparam, select, func, delete, insert, and_, exists, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload
 
+from app.cache.response_cache import LOCAL_CACHE_TTL_SECONDS
 from app.models.movie import Movie
 from app.models.director import Director
 from app.models.genre import Genre
 from app.models.movie_genres import movie_genres
 from app.models.movie_rating import MovieRating
 
+# Filtered totals for include_total, keyed by (title, release_year, genre).
+# Paging through a result set asks for the same total on every page; movie
+# writes in this process clear it, other workers catch up within the TTL,
+# which matches the staleness bound of the local response cache tier.
+_total_count_cache: TTLCache = TTLCache(maxsize=256, ttl=LOCAL_CACHE_TTL_SECONDS)
+# Bumped by every clear, so a COUNT that a write overtook is not cached
+_total_count_generation = 0
+
+# Client-supplied id lists go into IN (...) at most this many at a time, to
+# stay well under driver bind-parameter limits
+IN_BATCH_SIZE = 500
+
+
+def _chunks(items: Sequence[int], size: int = IN_BATCH_SIZE) -> Iterator[Sequence[int]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _movie_filter_conditions(
+    title_filter: str | None,
+    release_year_filter: int | None,
+    genre_filter: str | None,
+) -> list:
+    """Build the AND-ed WHERE conditions shared by the movie list queries."""
+    conditions = []
+    if title_filter:
+        conditions.append(Movie.title.ilike(f"%{title_filter}%"))
+    if release_year_filter is not None:
+        conditions.append(Movie.release_year == release_year_filter)
+    if genre_filter:
+        # Filter by genre name through the many-to-many relationship
+        genre_subquery = (
+            select(movie_genres.c.movie_id)
+            .join(Genre, movie_genres.c.genre_id == Genre.id)
+            .where(Genre.name.ilike(f"%{genre_filter}%"))
+        )
+        conditions.append(Movie.id.in_(genre_subquery))
+    return conditions
+
+
+# Fixed-shape statements are built once at import and executed with bound
+# parameters, skipping per-call construction and cache-key generation.
+_GET_MOVIE_STMT = (
+    select(Movie)
+    .where(Movie.id == bindparam("movie_id"))
+    .options(
+        joinedload(Movie.director),
+        selectinload(Movie.genres),
+    )
+    # sessions don't expire on commit, so reload relationships changed via the bridge table
+    .execution_options(populate_existing=True)
+)
+
+_GET_MOVIE_WITH_STATS_STMT = (
+    select(
+        Movie,
+        select(func.avg(MovieRating.score))
+        .where(MovieRating.movie_id == Movie.id)
+        .correlate(Movie)
+        .scalar_subquery(),
+        select(func.count(MovieRating.id))
+        .where(MovieRating.movie_id == Movie.id)
+        .correlate(Movie)
+        .scalar_subquery(),
+    )
+    .where(Movie.id == bindparam("movie_id"))
+    .options(
+        joinedload(Movie.director),
+        selectinload(Movie.genres),
+    )
+    .execution_options(populate_existing=True)
+)
+
+# One flat row per movie with everything the list view renders: director
+# columns come from the join, genre names are aggregated into an array and
+# rating stats are correlated subqueries, so a page of list items is a
+# single statement with no follow-up loads. Filters, the keyset cursor and
+# the limit are added per call.
+_MOVIE_LIST_ROWS_STMT = select(
+    Movie.id,
+    Movie.title,
+    Movie.release_year,
+    Director.id.label("director_id"),
+    Director.name.label("director_name"),
+    Director.birth_year.label("director_birth_year"),
+    Director.description.label("director_description"),
+    select(func.array_agg(aggregate_order_by(Genre.name, Genre.id)))
+    .select_from(movie_genres.join(Genre, movie_genres.c.genre_id == Genre.id))
+    .where(movie_genres.c.movie_id == Movie.id)
+    .correlate(Movie)
+    .scalar_subquery()
+    .label("genre_names"),
+    select(func.avg(MovieRating.score))
+    .where(MovieRating.movie_id == Movie.id)
+    .correlate(Movie)
+    .scalar_subquery()
+    .label("avg_score"),
+    select(func.count(MovieRating.id))
+    .where(MovieRating.movie_id == Movie.id)
+    .correlate(Movie)
+    .scalar_subquery()
+    .label("ratings_count"),
+).join(Director, Movie.director_id == Director.id)
+
+_MOVIE_EXISTS_STMT = select(exists().where(Movie.id == bindparam("movie_id")))
+
+_MOVIE_GENRE_IDS_STMT = select(movie_genres.c.genre_id).where(
+    movie_genres.c.movie_id == bindparam("movie_id")
+)
+
 
 class MoviesRepository:
     @staticmethod
-    def get_movie_by_id(db: Session, movie_id: int) -> Movie | None:
-        stmt = (
-            select(Movie)
-            .where(Movie.id == movie_id)
-            .options(
-                joinedload(Movie.director),
-                selectinload(Movie.genres),
-            )
-        )
-        return db.execute(stmt).scalars().first()
+    def clear_total_counts() -> None:
+        """Forget cached list totals; call after any write that adds, removes or refilters movies."""
+        global _total_count_generation
+        _total_count_generation += 1
+        _total_count_cache.clear()
 
     @staticmethod
-    def get_rating_stats(db: Session, movie_id: int) -> tuple[float | None, int]:
-        stmt = (
-            select(func.avg(MovieRating.score), func.count(MovieRating.id))
-            .where(MovieRating.movie_id == movie_id)
-        )
-        avg_, cnt_ = db.execute(stmt).one()
-        # avg_ may be Decimal depending on dialect; convert safely later in service
-        return avg_, int(cnt_)
+    async def get_movie(db: AsyncSession, movie_id: int) -> Movie | None:
+        """
+        Return the movie without eager-loading relationships.
+
+        Goes through the identity map first, so a movie already loaded in
+        this session costs no query.
+        """
+        return await db.get(Movie, movie_id)
 
     @staticmethod
-    def director_exists(db: Session, director_id: int) -> bool:
-        stmt = select(func.count(Director.id)).where(Director.id == director_id)
-        return db.execute(stmt).scalar_one() > 0
+    async def get_movie_by_id(db: AsyncSession, movie_id: int) -> Movie | None:
+        return (await db.execute(_GET_MOVIE_STMT, {"movie_id": movie_id})).scalars().first()
 
     @staticmethod
-    def get_genres_by_ids(db: Session, genre_ids: list[int]) -> list[Genre]:
-        if not genre_ids:
-            return []
-        stmt = select(Genre).where(Genre.id.in_(genre_ids))
-        return list(db.execute(stmt).scalars().all())
+    async def get_movie_with_stats(
+        db: AsyncSession, movie_id: int
+    ) -> tuple[Movie, float | None, int] | None:
+        """
+        Return (movie, average_score, ratings_count) in one query, or None.
+
+        The rating stats are correlated scalar subqueries in the same SELECT
+        as the movie, so the detail view needs no separate aggregate query.
+        """
+        row = (await db.execute(_GET_MOVIE_WITH_STATS_STMT, {"movie_id": movie_id})).first()
+        if row is None:
+            return None
+        movie, avg_, cnt_ = row
+        # avg_ may be Decimal depending on dialect; convert safely later in service
+        return movie, avg_, int(cnt_)
 
     @staticmethod
-    def create_movie(db: Session, movie: Movie) -> Movie:
+    async def movie_exists(db: AsyncSession, movie_id: int) -> bool:
+        return bool((await db.execute(_MOVIE_EXISTS_STMT, {"movie_id": movie_id})).scalar())
+
+    @staticmethod
+    async def create_movie(db: AsyncSession, movie: Movie) -> Movie:
         db.add(movie)
-        db.flush()  # get movie.id
-        db.refresh(movie)
+        await db.flush()  # get movie.id; callers re-read the full movie after commit
         return movie
 
     @staticmethod
-    def delete_movie(db: Session, movie: Movie) -> None:
-        db.delete(movie)
+    async def delete_movie(db: AsyncSession, movie: Movie) -> None:
+        await db.delete(movie)
+
+    @staticmethod
+    async def add_movie_genres(db: AsyncSession, movie_id: int, genre_ids: list[int]) -> bool:
+        """
+        Link the movie to each of `genre_ids` (no duplicates); return False if any does not exist.
+
+        The rows come from INSERT ... SELECT over `genres`, so unknown ids are
+        skipped and show up as a count lower than len(genre_ids) instead of
+        needing a separate existence query.
+        """
+        added = 0
+        for batch in _chunks(genre_ids):
+            stmt = (
+                pg_insert(movie_genres)
+                .from_select(
+                    ["movie_id", "genre_id"],
+                    select(literal(movie_id), Genre.id).where(Genre.id.in_(batch)),
+                )
+                # a concurrent update may have added the same pair already
+                .on_conflict_do_nothing()
+                # rowcount is only kept for UPDATE/DELETE unless asked for
+                .execution_options(preserve_rowcount=True)
+            )
+            added += (await db.execute(stmt)).rowcount
+        if added == len(genre_ids):
+            return True
+
+        # Pairs skipped by ON CONFLICT also lower the count, so only a short
+        # count pays for telling them apart from unknown genre ids
+        existing = 0
+        for batch in _chunks(genre_ids):
+            existing += (
+                await db.execute(select(func.count(Genre.id)).where(Genre.id.in_(batch)))
+            ).scalar_one()
+        return existing == len(genre_ids)
 
     @staticmethod
-    def replace_movie_genres(db: Session, movie_id: int, genre_ids: list[int]) -> None:
-        # remove existing
-        db.execute(delete(movie_genres).where(movie_genres.c.movie_id == movie_id))
-        # add new
-        if genre_ids:
-            rows = [{"movie_id": movie_id, "genre_id": gid} for gid in genre_ids]
-            db.execute(movie_genres.insert(), rows)
+    async def replace_movie_genres(
+        db: AsyncSession,
+        movie_id: int,
+        genre_ids: list[int],
+        current_genre_ids: Iterable[int] | None = None,
+    ) -> bool:
+        """
+        Make the movie's genres exactly `genre_ids`, touching only rows that change.
+
+        Pass `current_genre_ids` when the movie's genres are already loaded
+        to skip reading the bridge table. Returns False if some of the
+        genres to add do not exist.
+        """
+        if current_genre_ids is None:
+            result = await db.execute(_MOVIE_GENRE_IDS_STMT, {"movie_id": movie_id})
+            current_genre_ids = result.scalars().all()
+        current = set(current_genre_ids)
+        wanted = set(genre_ids)
+
+        for batch in _chunks(sorted(current - wanted)):
+            await db.execute(
+                delete(movie_genres).where(
+                    movie_genres.c.movie_id == movie_id,
+                    movie_genres.c.genre_id.in_(batch),
+                )
+            )
+
+        return await MoviesRepository.add_movie_genres(db, movie_id, sorted(wanted - current))
 
     @staticmethod
-    def get_movies_paginated(
-        db: Session,
-        page: int,
+    async def get_movies_paginated(
+        db: AsyncSession,
         page_size: int,
+        after_id: int | None = None,
         title_filter: str | None = None,
         release_year_filter: int | None = None,
         genre_filter: str | None = None,
-    ) -> tuple[Sequence[Movie], int]:
+        include_total: bool = False,
+    ) -> tuple[Sequence[Row], int | None, int | None]:
         """
-        Get paginated list of movies with optional filters.
+        Get one page of movies with optional filters, using keyset pagination.
 
-        Returns tuple of (movies, total_count).
+        Returns tuple of (rows, next_cursor, total_count), where each row
+        carries the movie, its director, genre names and rating stats (see
+        _MOVIE_LIST_ROWS_STMT). Rows start after the movie with
+        id `after_id`; `next_cursor` is the id to pass as `after_id` for the
+        following page, or None on the last page. `total_count` is only
+        computed when `include_total` is set, since it scans the whole
+        filtered set.
         Supports filtering by title (partial match), release_year, and genre name.
         All filters are combined with AND logic.
         """
-        # Build filter conditions
-        conditions = []
-        if title_filter:
-            conditions.append(Movie.title.ilike(f"%{title_filter}%"))
-        if release_year_filter is not None:
-            conditions.append(Movie.release_year == release_year_filter)
-        if genre_filter:
-            # Filter by genre name through the many-to-many relationship
-            genre_subquery = (
-                select(movie_genres.c.movie_id)
-                .join(Genre, movie_genres.c.genre_id == Genre.id)
-                .where(Genre.name.ilike(f"%{genre_filter}%"))
-            )
-            conditions.append(Movie.id.in_(genre_subquery))
+        conditions = _movie_filter_conditions(title_filter, release_year_filter, genre_filter)
 
-        # Get total count before pagination
-        count_stmt = select(func.count(Movie.id))
-        if conditions:
-            count_stmt = count_stmt.where(and_(*conditions))
-        total_count = db.execute(count_stmt).scalar_one()
-
-        # Base query with joins and filters
-        stmt = (
-            select(Movie)
-            .options(
-                joinedload(Movie.director),
-                selectinload(Movie.genres),
-            )
-        )
+        total_count = None
+        if include_total:
+            count_key = (title_filter, release_year_filter, genre_filter)
+            total_count = _total_count_cache.get(count_key)
+            if total_count is None:
+                generation = _total_count_generation
+                count_stmt = select(func.count(Movie.id))
+                if conditions:
+                    count_stmt = count_stmt.where(and_(*conditions))
+                total_count = (await db.execute(count_stmt)).scalar_one()
+                # a write that committed during the COUNT may not be in it
+                if generation == _total_count_generation:
+                    _total_count_cache[count_key] = total_count
+
+        # Base query with filters
+        stmt = _MOVIE_LIST_ROWS_STMT
         if conditions:
             stmt = stmt.where(and_(*conditions))
+        if after_id is not None:
+            stmt = stmt.where(Movie.id > after_id)
+
+        # Fetch one extra row to tell whether another page follows
+        stmt = stmt.order_by(Movie.id).limit(page_size + 1)
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        stmt = stmt.offset(offset).limit(page_size)
+        # A page is at most 101 rows, so it is fetched in one buffered round
+        # trip; server-side cursors (yield_per) are reserved for stream_movies,
+        # where they would otherwise add a FETCH round trip per batch.
+        rows = (await db.execute(stmt)).all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = rows[-1].id
+        return rows, next_cursor, total_count
 
-        # Order by id for consistent pagination
-        stmt = stmt.order_by(Movie.id)
+    @staticmethod
+    async def stream_movies(
+        db: AsyncSession,
+        title_filter: str | None = None,
+        release_year_filter: int | None = None,
+        genre_filter: str | None = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[Row]:
+        """
+        Stream list-view rows for every movie matching the filters, ordered by id.
+
+        Rows are fetched from a server-side cursor `batch_size` at a time,
+        so memory stays flat regardless of how many movies match.
+        """
+        stmt = _MOVIE_LIST_ROWS_STMT
+        conditions = _movie_filter_conditions(title_filter, release_year_filter, genre_filter)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        stmt = stmt.order_by(Movie.id).execution_options(yield_per=batch_size)
 
-        movies = db.execute(stmt).scalars().unique().all()
-        return movies, total_count
+        result = await db.stream(stmt)
+        async for row in result:
+            yield row
 
     @staticmethod
-    def create_rating(db: Session, movie_id: int, score: int) -> MovieRating:
+    async def create_rating(db: AsyncSession, movie_id: int, score: int) -> MovieRating:
         """Create a new rating for a movie."""
-        rating = MovieRating(movie_id=movie_id, score=score)
-        db.add(rating)
-        db.flush()
-        db.refresh(rating)
-        return rating
+        # RETURNING brings back id and created_at with the INSERT itself
+        stmt = insert(MovieRating).values(movie_id=movie_id, score=score).returning(MovieRating)
+        return (await db.execute(stmt)).scalar_one()
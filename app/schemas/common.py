@@ -1,5 +1,9 @@
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
 
 class ErrorPayload(BaseModel):
     code: int
@@ -11,6 +15,6 @@ class FailureResponse(BaseModel):
     error: ErrorPayload
 
 
-class SuccessResponse(BaseModel):
+class SuccessResponse(BaseModel, Generic[T]):
     status: str = "success"
-    data: object
+    data: T
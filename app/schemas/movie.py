@@ -56,7 +56,7 @@ class MovieListItemOut(BaseModel):
 class PaginatedMoviesOut(BaseModel):
     """Schema for paginated movies list response."""
 
-    page: int
     page_size: int
-    total_items: int
+    next_cursor: int | None = None  # pass as after_id to fetch the next page
+    total_items: int | None = None  # only set when include_total=true
     items: Sequence[MovieListItemOut]
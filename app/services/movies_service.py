@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+from collections.abc import AsyncIterator
+
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions.api_exceptions import NotFoundError, BadRequestError, UnprocessableEntityError
 from app.models.movie import Movie
@@ -16,72 +20,68 @@ from app.schemas.director import DirectorOut
 from app.schemas.genre import GenreOut
 from app.schemas.rating import RatingCreate, RatingOut
 
+# Postgres' default name for the movies.director_id foreign key
+DIRECTOR_FK = "movies_director_id_fkey"
 
-class MoviesService:
-    @staticmethod
-    def get_movie_detail(db: Session, movie_id: int) -> MovieDetailOut:
-        movie = MoviesRepository.get_movie_by_id(db, movie_id)
-        if not movie:
-            raise NotFoundError("Movie not found")
 
-        avg_score, cnt = MoviesRepository.get_rating_stats(db, movie_id)
-        avg_val = float(avg_score) if avg_score is not None else None
+def _violated_constraint(exc: IntegrityError) -> str | None:
+    """Name of the constraint behind an IntegrityError, when the driver reports it."""
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
 
-        return MovieDetailOut(
-            id=movie.id,
-            title=movie.title,
-            director=DirectorOut(
-                id=movie.director.id,
-                name=movie.director.name,
-                birth_year=movie.director.birth_year,
-                description=movie.director.description,
-            ),
-            release_year=movie.release_year,
-            cast=movie.cast,
-            genres=[
-                GenreOut(id=g.id, name=g.name, description=g.description)
-                for g in movie.genres
-            ],
-            average_rating=avg_val,
-            ratings_count=cnt,
-        )
 
+class MoviesService:
     @staticmethod
-    def create_movie(db: Session, payload: MovieCreate) -> MovieDetailOut:
-        # validate director exists
-        if not MoviesRepository.director_exists(db, payload.director_id):
-            raise BadRequestError("director_id does not exist")
+    async def get_movie_detail(db: AsyncSession, movie_id: int) -> MovieDetailOut:
+        row = await MoviesRepository.get_movie_with_stats(db, movie_id)
+        if row is None:
+            raise NotFoundError("Movie not found")
 
-        # validate genres exist
-        unique_genre_ids = sorted(set(payload.genre_ids))
-        genres = MoviesRepository.get_genres_by_ids(db, unique_genre_ids)
-        if len(genres) != len(unique_genre_ids):
-            raise BadRequestError("One or more genre_ids do not exist")
+        return MoviesService._to_detail(*row)
 
+    @staticmethod
+    async def create_movie(db: AsyncSession, payload: MovieCreate) -> MovieDetailOut:
         movie = Movie(
             title=payload.title,
             director_id=payload.director_id,
             release_year=payload.release_year,
             cast=payload.cast,
         )
-        MoviesRepository.create_movie(db, movie)
+        # the director_id foreign key doubles as the existence check
+        try:
+            await MoviesRepository.create_movie(db, movie)
+        except IntegrityError as e:
+            await db.rollback()
+            if _violated_constraint(e) == DIRECTOR_FK:
+                raise BadRequestError("director_id does not exist") from e
+            raise
 
-        # sync genres bridge
-        MoviesRepository.replace_movie_genres(db, movie.id, unique_genre_ids)
+        # link genres; unknown ids are skipped by the INSERT ... SELECT
+        unique_genre_ids = sorted(set(payload.genre_ids))
+        if not await MoviesRepository.add_movie_genres(db, movie.id, unique_genre_ids):
+            await db.rollback()
+            raise BadRequestError("One or more genre_ids do not exist")
 
-        db.commit()
-        return MoviesService.get_movie_detail(db, movie.id)
+        await db.commit()
+        MoviesRepository.clear_total_counts()
+
+        # load director and genres; a new movie has no ratings yet
+        movie = await MoviesRepository.get_movie_by_id(db, movie.id)
+        return MoviesService._to_detail(movie, None, 0)
 
     @staticmethod
-    def update_movie(db: Session, movie_id: int, payload: MovieUpdate) -> MovieDetailOut:
-        movie = MoviesRepository.get_movie_by_id(db, movie_id)
-        if not movie:
+    async def update_movie(db: AsyncSession, movie_id: int, payload: MovieUpdate) -> MovieDetailOut:
+        row = await MoviesRepository.get_movie_with_stats(db, movie_id)
+        if row is None:
             raise NotFoundError("Movie not found")
+        # an update never touches ratings, so the stats loaded here stay valid
+        movie, avg_score, cnt = row
+        relations_changed = False
 
-        if payload.director_id is not None:
-            if not MoviesRepository.director_exists(db, payload.director_id):
-                raise BadRequestError("director_id does not exist")
+        if payload.director_id is not None and payload.director_id != movie.director_id:
+            # checked by the director_id foreign key when the update is flushed
             movie.director_id = payload.director_id
+            relations_changed = True
 
         if payload.title is not None:
             movie.title = payload.title
@@ -95,42 +95,63 @@ class MoviesService:
         # genre replacement: only if provided
         if payload.genre_ids is not None:
             unique_genre_ids = sorted(set(payload.genre_ids))
-            genres = MoviesRepository.get_genres_by_ids(db, unique_genre_ids)
-            if len(genres) != len(unique_genre_ids):
-                raise BadRequestError("One or more genre_ids do not exist")
-            MoviesRepository.replace_movie_genres(db, movie.id, unique_genre_ids)
+            current_genre_ids = sorted(g.id for g in movie.genres)
+            if unique_genre_ids != current_genre_ids:
+                if not await MoviesRepository.replace_movie_genres(
+                    db, movie.id, unique_genre_ids, current_genre_ids
+                ):
+                    await db.rollback()
+                    raise BadRequestError("One or more genre_ids do not exist")
+                relations_changed = True
 
-        db.commit()
-        return MoviesService.get_movie_detail(db, movie.id)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if _violated_constraint(e) == DIRECTOR_FK:
+                raise BadRequestError("director_id does not exist") from e
+            raise
+        MoviesRepository.clear_total_counts()
+
+        # sessions don't expire on commit, so the loaded movie is current
+        # unless director or genres were swapped underneath it
+        if relations_changed:
+            movie = await MoviesRepository.get_movie_by_id(db, movie.id)
+        return MoviesService._to_detail(movie, avg_score, cnt)
 
     @staticmethod
-    def delete_movie(db: Session, movie_id: int) -> None:
-        movie = MoviesRepository.get_movie_by_id(db, movie_id)
+    async def delete_movie(db: AsyncSession, movie_id: int) -> None:
+        movie = await MoviesRepository.get_movie(db, movie_id)
         if not movie:
             raise NotFoundError("Movie not found")
 
-        MoviesRepository.delete_movie(db, movie)
-        db.commit()
+        await MoviesRepository.delete_movie(db, movie)
+        await db.commit()
+        MoviesRepository.clear_total_counts()
 
     @staticmethod
-    def get_movies_list(
-        db: Session,
-        page: int = 1,
+    async def get_movies_list(
+        db: AsyncSession,
         page_size: int = 10,
+        after_id: int | None = None,
         title: str | None = None,
         release_year: int | None = None,
         genre: str | None = None,
+        include_total: bool = False,
     ) -> PaginatedMoviesOut:
         """
-        Get paginated list of movies with optional filters.
+        Get a page of movies with optional filters.
 
+        Pages are keyed by movie id: pass the previous page's `next_cursor`
+        as `after_id` to continue. The total number of matches is only
+        counted when `include_total` is set.
         Supports filtering by title (partial match), release_year, and genre name.
         All filters can be combined (AND logic).
         Returns paginated list with rating statistics for each movie.
         """
         # Validate pagination parameters
-        if page < 1:
-            raise UnprocessableEntityError("page must be >= 1")
+        if after_id is not None and after_id < 0:
+            raise UnprocessableEntityError("after_id must be >= 0")
         if page_size < 1 or page_size > 100:
             raise UnprocessableEntityError("page_size must be between 1 and 100")
 
@@ -138,48 +159,95 @@ class MoviesService:
         if release_year is not None and (release_year < 1888 or release_year > 2100):
             raise UnprocessableEntityError("Invalid release_year")
 
-        movies, total_count = MoviesRepository.get_movies_paginated(
+        rows, next_cursor, total_count = await MoviesRepository.get_movies_paginated(
             db=db,
-            page=page,
             page_size=page_size,
+            after_id=after_id,
             title_filter=title,
             release_year_filter=release_year,
             genre_filter=genre,
+            include_total=include_total,
         )
 
-        # Build list items with rating stats
-        items = []
-        for movie in movies:
-            avg_rating, ratings_count = MoviesRepository.get_rating_stats(db, movie.id)
-            # Convert Decimal to float for JSON serialization
-            avg_val = float(avg_rating) if avg_rating is not None else None
-
-            items.append(
-                MovieListItemOut(
-                    id=movie.id,
-                    title=movie.title,
-                    release_year=movie.release_year,
-                    director=DirectorOut(
-                        id=movie.director.id,
-                        name=movie.director.name,
-                        birth_year=movie.director.birth_year,
-                        description=movie.director.description,
-                    ),
-                    genres=[g.name for g in movie.genres],
-                    average_rating=avg_val,
-                    ratings_count=ratings_count,
-                )
-            )
+        items = [MoviesService._to_list_item(row) for row in rows]
 
         return PaginatedMoviesOut(
-            page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
             total_items=total_count,
             items=items,
         )
 
     @staticmethod
-    def create_rating(db: Session, movie_id: int, payload: RatingCreate) -> RatingOut:
+    async def export_movies(
+        db: AsyncSession,
+        title: str | None = None,
+        release_year: int | None = None,
+        genre: str | None = None,
+    ) -> AsyncIterator[MovieListItemOut]:
+        """
+        Yield every movie matching the filters as a list item, in id order.
+
+        Rows are streamed from the database in batches rather than loaded
+        up front, so exports of the whole catalog run in constant memory.
+        """
+        async for row in MoviesRepository.stream_movies(
+            db,
+            title_filter=title,
+            release_year_filter=release_year,
+            genre_filter=genre,
+        ):
+            yield MoviesService._to_list_item(row)
+
+    @staticmethod
+    def _to_detail(movie: Movie, avg_rating, ratings_count: int) -> MovieDetailOut:
+        # Built from DB rows that already match the schema, so skip validation
+        # Convert Decimal to float for JSON serialization
+        avg_val = float(avg_rating) if avg_rating is not None else None
+
+        return MovieDetailOut.model_construct(
+            id=movie.id,
+            title=movie.title,
+            director=DirectorOut.model_construct(
+                id=movie.director.id,
+                name=movie.director.name,
+                birth_year=movie.director.birth_year,
+                description=movie.director.description,
+            ),
+            release_year=movie.release_year,
+            cast=movie.cast,
+            genres=[
+                GenreOut.model_construct(id=g.id, name=g.name, description=g.description)
+                for g in movie.genres
+            ],
+            average_rating=avg_val,
+            ratings_count=ratings_count,
+        )
+
+    @staticmethod
+    def _to_list_item(row: Row) -> MovieListItemOut:
+        # Built from DB rows that already match the schema, so skip validation
+        # Convert Decimal to float for JSON serialization
+        avg_val = float(row.avg_score) if row.avg_score is not None else None
+
+        return MovieListItemOut.model_construct(
+            id=row.id,
+            title=row.title,
+            release_year=row.release_year,
+            director=DirectorOut.model_construct(
+                id=row.director_id,
+                name=row.director_name,
+                birth_year=row.director_birth_year,
+                description=row.director_description,
+            ),
+            # array_agg over no rows is NULL
+            genres=row.genre_names or [],
+            average_rating=avg_val,
+            ratings_count=row.ratings_count,
+        )
+
+    @staticmethod
+    async def create_rating(db: AsyncSession, movie_id: int, payload: RatingCreate) -> RatingOut:
         """
         Create a new rating for a movie.
 
@@ -187,13 +255,12 @@ class MoviesService:
         Score validation is handled by Pydantic schema.
         """
         # Validate movie exists
-        movie = MoviesRepository.get_movie_by_id(db, movie_id)
-        if not movie:
+        if not await MoviesRepository.movie_exists(db, movie_id):
             raise NotFoundError("Movie not found")
 
         # Create rating (score is already validated by Pydantic schema)
-        rating = MoviesRepository.create_rating(db, movie_id, payload.score)
-        db.commit()
+        rating = await MoviesRepository.create_rating(db, movie_id, payload.score)
+        await db.commit()
 
         return RatingOut(
             rating_id=rating.id,
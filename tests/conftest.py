@@ -0,0 +1,108 @@
+"""
+Shared fixtures for the API tests.
+
+The repositories use PostgreSQL-only SQL (INSERT ... ON CONFLICT,
+array_agg), so the tests run against a real database. Point
+TEST_DATABASE_URL at a database that may be wiped: its tables are dropped
+and recreated at the start of the run. Without it, database-backed tests
+are skipped.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# app.db.session builds its engine from DATABASE_URL at import time
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+# keep the response cache in-process so runs never share cached state
+os.environ.pop("REDIS_URL", None)
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Iterator[Engine]:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    import app.models  # noqa: F401  registers every table on Base.metadata
+    from app.db.base import Base
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def app_client(db_engine: Engine):
+    from fastapi.testclient import TestClient
+
+    from app.db.session import engine
+    from app.main import app
+
+    # one client for the whole run: pooled connections belong to its event loop
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(engine.dispose)
+
+
+@pytest.fixture
+def client(app_client, db_engine: Engine):
+    """The API client, over a database holding only the seed directors and genres."""
+    from app.cache.response_cache import ResponseCache
+    from app.repositories.movies_repository import MoviesRepository
+
+    with db_engine.begin() as conn:
+        conn.execute(
+            text(
+                "TRUNCATE movie_ratings, movie_genres, movies, genres, directors "
+                "RESTART IDENTITY CASCADE"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO directors (id, name, birth_year) "
+                "VALUES (1, 'Christopher Nolan', 1970), (2, 'Francis Ford Coppola', 1939)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO genres (id, name) VALUES (1, 'Drama'), (2, 'Crime'), (3, 'Sci-Fi')")
+        )
+
+    # the rows above changed without going through the API
+    app_client.portal.call(ResponseCache.invalidate, "movies")
+    MoviesRepository.clear_total_counts()
+    return app_client
+
+
+@pytest.fixture
+def make_movie(client):
+    """Create a movie through the API and return its detail payload."""
+
+    def make(
+        title: str = "Inception",
+        director_id: int = 1,
+        release_year: int = 2010,
+        genre_ids: list[int] | None = None,
+    ) -> dict:
+        response = client.post(
+            "/api/v1/movies",
+            json={
+                "title": title,
+                "director_id": director_id,
+                "release_year": release_year,
+                "genre_ids": genre_ids or [],
+            },
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["data"]
+
+    return make
@@ -0,0 +1,33 @@
+import orjson
+
+EXPORT_URL = "/api/v1/movies/export"
+
+
+def _export(client, **params) -> list[dict]:
+    response = client.get(EXPORT_URL, params=params)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [orjson.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_streams_every_movie_as_a_line(client, make_movie):
+    ids = [make_movie(title=f"Movie {n}")["id"] for n in range(3)]
+
+    assert [item["id"] for item in _export(client)] == ids
+
+
+def test_export_applies_filters(client, make_movie):
+    make_movie(title="The Godfather", director_id=2, release_year=1972, genre_ids=[1, 2])
+    make_movie(title="Inception", genre_ids=[1, 3])
+
+    items = _export(client, genre="crime")
+    assert [item["title"] for item in items] == ["The Godfather"]
+    assert items[0]["genres"] == ["Drama", "Crime"]
+    assert items[0]["director"]["name"] == "Francis Ford Coppola"
+
+
+def test_export_of_no_matches_is_empty(client):
+    response = client.get(EXPORT_URL)
+
+    assert response.status_code == 200
+    assert response.text == ""
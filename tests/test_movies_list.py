@@ -0,0 +1,128 @@
+LIST_URL = "/api/v1/movies"
+
+
+def _page(client, **params) -> dict:
+    response = client.get(LIST_URL, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def test_pages_follow_next_cursor(client, make_movie):
+    ids = [make_movie(title=f"Movie {n}")["id"] for n in range(5)]
+
+    first = _page(client, page_size=2)
+    assert [m["id"] for m in first["items"]] == ids[:2]
+    assert first["next_cursor"] == ids[1]
+    assert first["total_items"] is None
+
+    second = _page(client, page_size=2, after_id=first["next_cursor"])
+    assert [m["id"] for m in second["items"]] == ids[2:4]
+
+    last = _page(client, page_size=2, after_id=second["next_cursor"])
+    assert [m["id"] for m in last["items"]] == ids[4:]
+    assert last["next_cursor"] is None
+
+
+def test_exact_last_page_has_no_cursor(client, make_movie):
+    ids = [make_movie(title=f"Movie {n}")["id"] for n in range(2)]
+
+    page = _page(client, page_size=2)
+    assert [m["id"] for m in page["items"]] == ids
+    assert page["next_cursor"] is None
+
+
+def test_filters_apply_across_pages(client, make_movie):
+    make_movie(title="The Godfather", director_id=2, release_year=1972, genre_ids=[1, 2])
+    make_movie(title="Inception", genre_ids=[1, 3])
+    make_movie(title="The Godfather Part II", director_id=2, release_year=1974, genre_ids=[2])
+    make_movie(title="The Conversation", director_id=2, release_year=1974, genre_ids=[1])
+
+    first = _page(client, page_size=1, genre="crim")
+    assert [m["title"] for m in first["items"]] == ["The Godfather"]
+    rest = _page(client, page_size=1, genre="crim", after_id=first["next_cursor"])
+    assert [m["title"] for m in rest["items"]] == ["The Godfather Part II"]
+    assert rest["next_cursor"] is None
+
+    page = _page(client, title="godfather", release_year=1974)
+    assert [m["title"] for m in page["items"]] == ["The Godfather Part II"]
+
+
+def test_invalid_paging_parameters_are_rejected(client):
+    assert client.get(LIST_URL, params={"after_id": -1}).status_code == 422
+    assert client.get(LIST_URL, params={"page_size": 0}).status_code == 422
+    assert client.get(LIST_URL, params={"page_size": 101}).status_code == 422
+
+
+def test_include_total_counts_every_match(client, make_movie):
+    make_movie(title="The Godfather", director_id=2, release_year=1972)
+    make_movie(title="The Godfather Part II", director_id=2, release_year=1974)
+    make_movie(title="Inception")
+
+    assert _page(client, page_size=1, include_total=True)["total_items"] == 3
+    assert _page(client, page_size=1, title="godfather", include_total=True)["total_items"] == 2
+
+
+def test_include_total_follows_writes(client, make_movie):
+    first = make_movie(title="Inception")
+    assert _page(client, include_total=True)["total_items"] == 1
+
+    make_movie(title="Interstellar")
+    assert _page(client, include_total=True)["total_items"] == 2
+
+    assert client.delete(f"{LIST_URL}/{first['id']}").status_code == 204
+    assert _page(client, include_total=True)["total_items"] == 1
+
+
+def test_total_counted_across_a_write_is_not_cached(client, make_movie):
+    from app.db.session import AsyncSessionLocal
+    from app.models.movie import Movie
+    from app.repositories.movies_repository import MoviesRepository
+
+    make_movie(title="Inception")
+
+    async def count_racing_a_create() -> int | None:
+        async with AsyncSessionLocal() as db:
+            execute = db.execute
+
+            async def execute_then_create(*args, **kwargs):
+                result = await execute(*args, **kwargs)
+                # another request creates a movie while the COUNT is in flight
+                async with AsyncSessionLocal() as writer:
+                    await MoviesRepository.create_movie(
+                        writer, Movie(title="Interstellar", director_id=1, release_year=2014)
+                    )
+                    await writer.commit()
+                MoviesRepository.clear_total_counts()
+                db.execute = execute
+                return result
+
+            db.execute = execute_then_create
+            _, _, total = await MoviesRepository.get_movies_paginated(
+                db, page_size=10, include_total=True
+            )
+            return total
+
+    assert client.portal.call(count_racing_a_create) == 1
+    assert _page(client, include_total=True)["total_items"] == 2
+
+
+def test_items_carry_director_genres_and_rating_stats(client, make_movie):
+    rated = make_movie(title="Inception", genre_ids=[3, 1])
+    make_movie(title="Unrated", director_id=2, release_year=1999)
+    for score in (8, 5):
+        response = client.post(f"{LIST_URL}/{rated['id']}/ratings", json={"score": score})
+        assert response.status_code == 201, response.text
+
+    first, second = _page(client)["items"]
+
+    assert first["director"] == {
+        "id": 1,
+        "name": "Christopher Nolan",
+        "birth_year": 1970,
+        "description": None,
+    }
+    assert first["genres"] == ["Drama", "Sci-Fi"]
+    assert (first["average_rating"], first["ratings_count"]) == (6.5, 2)
+
+    assert second["genres"] == []
+    assert (second["average_rating"], second["ratings_count"]) == (None, 0)
@@ -0,0 +1,119 @@
+MOVIES_URL = "/api/v1/movies"
+
+
+def _list_titles(client) -> list[str]:
+    response = client.get(MOVIES_URL)
+    assert response.status_code == 200, response.text
+    return [m["title"] for m in response.json()["data"]["items"]]
+
+
+def test_create_with_unknown_director_is_rejected(client):
+    response = client.post(
+        MOVIES_URL, json={"title": "Orphan", "director_id": 99, "release_year": 2000}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "director_id does not exist"
+    assert _list_titles(client) == []
+
+
+def test_update_with_unknown_director_is_rejected(client, make_movie):
+    movie = make_movie(title="Inception")
+
+    response = client.put(f"{MOVIES_URL}/{movie['id']}", json={"title": "Renamed", "director_id": 99})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "director_id does not exist"
+    detail = client.get(f"{MOVIES_URL}/{movie['id']}").json()["data"]
+    assert detail["title"] == "Inception"
+    assert detail["director"]["id"] == 1
+
+
+def test_update_changes_director(client, make_movie):
+    movie = make_movie(title="Inception")
+
+    response = client.put(f"{MOVIES_URL}/{movie['id']}", json={"director_id": 2})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["director"]["name"] == "Francis Ford Coppola"
+
+
+def test_create_links_genres(client, make_movie):
+    movie = make_movie(title="Inception", genre_ids=[3, 1, 3])
+
+    assert [g["name"] for g in movie["genres"]] == ["Drama", "Sci-Fi"]
+    detail = client.get(f"{MOVIES_URL}/{movie['id']}").json()["data"]
+    assert [g["id"] for g in detail["genres"]] == [1, 3]
+
+
+def test_create_with_unknown_genre_is_rejected(client):
+    response = client.post(
+        MOVIES_URL,
+        json={"title": "Orphan", "director_id": 1, "release_year": 2000, "genre_ids": [1, 99]},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "One or more genre_ids do not exist"
+    assert _list_titles(client) == []
+
+
+def test_update_with_unknown_genre_is_rejected(client, make_movie):
+    movie = make_movie(title="Inception", genre_ids=[1])
+
+    response = client.put(f"{MOVIES_URL}/{movie['id']}", json={"genre_ids": [2, 99]})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "One or more genre_ids do not exist"
+    detail = client.get(f"{MOVIES_URL}/{movie['id']}").json()["data"]
+    assert [g["id"] for g in detail["genres"]] == [1]
+
+
+def test_genres_linked_concurrently_are_not_reported_unknown(client, make_movie):
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.movies_repository import MoviesRepository
+
+    movie = make_movie(title="Inception", genre_ids=[1])
+
+    async def replace_from_stale_view() -> bool:
+        async with AsyncSessionLocal() as db:
+            # as if genre 1 was linked by another request after this one read the genres
+            ok = await MoviesRepository.replace_movie_genres(
+                db, movie["id"], [1, 2], current_genre_ids=[]
+            )
+            await db.commit()
+            return ok
+
+    assert client.portal.call(replace_from_stale_view) is True
+    detail = client.get(f"{MOVIES_URL}/{movie['id']}").json()["data"]
+    assert [g["id"] for g in detail["genres"]] == [1, 2]
+
+
+def test_update_replaces_genres(client, make_movie):
+    movie = make_movie(title="Inception", genre_ids=[1, 3])
+
+    response = client.put(f"{MOVIES_URL}/{movie['id']}", json={"genre_ids": [3, 2]})
+
+    assert response.status_code == 200, response.text
+    assert [g["id"] for g in response.json()["data"]["genres"]] == [2, 3]
+    detail = client.get(f"{MOVIES_URL}/{movie['id']}").json()["data"]
+    assert [g["id"] for g in detail["genres"]] == [2, 3]
+
+
+def test_update_can_clear_genres(client, make_movie):
+    movie = make_movie(title="Inception", genre_ids=[1, 3])
+
+    response = client.put(f"{MOVIES_URL}/{movie['id']}", json={"genre_ids": []})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["genres"] == []
+
+
+def test_update_without_genre_ids_keeps_genres(client, make_movie):
+    movie = make_movie(title="Inception", genre_ids=[1, 3])
+
+    response = client.put(f"{MOVIES_URL}/{movie['id']}", json={"title": "Inception (2010)"})
+
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert data["title"] == "Inception (2010)"
+    assert [g["id"] for g in data["genres"]] == [1, 3]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from cachetools import TTLCache
+
+from app.cache.response_cache import ResponseCache, cached
+
+MOVIES_URL = "/api/v1/movies"
+
+
+def _get(client, url: str) -> tuple[dict, str | None]:
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    return response.json()["data"], response.headers.get("x-cache")
+
+
+def test_list_is_served_from_cache_until_a_write(client, make_movie):
+    make_movie(title="Inception")
+
+    assert _get(client, MOVIES_URL)[1] == "MISS"
+    data, cache = _get(client, MOVIES_URL)
+    assert cache == "HIT"
+    assert [m["title"] for m in data["items"]] == ["Inception"]
+
+    make_movie(title="Interstellar")
+
+    data, cache = _get(client, MOVIES_URL)
+    assert cache == "MISS"
+    assert [m["title"] for m in data["items"]] == ["Inception", "Interstellar"]
+
+
+def test_detail_reflects_ratings_and_updates(client, make_movie):
+    movie = make_movie(title="Inception")
+    url = f"{MOVIES_URL}/{movie['id']}"
+    assert _get(client, url)[0]["ratings_count"] == 0
+    assert _get(client, url)[1] == "HIT"
+
+    assert client.post(f"{url}/ratings", json={"score": 8}).status_code == 201
+    data, cache = _get(client, url)
+    assert cache == "MISS"
+    assert (data["ratings_count"], data["average_rating"]) == (1, 8.0)
+
+    assert client.put(url, json={"title": "Inception (2010)"}).status_code == 200
+    assert _get(client, url)[0]["title"] == "Inception (2010)"
+
+    assert client.delete(url).status_code == 204
+    assert client.get(url).status_code == 404
+
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    """An in-process-only ResponseCache, restored after the test."""
+    monkeypatch.setattr(ResponseCache, "_redis", None)
+    monkeypatch.setattr(ResponseCache, "_local", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(ResponseCache, "_generations", {})
+
+
+def test_read_racing_a_write_is_not_served_after_it(local_cache):
+    state = {"value": 1}
+
+    async def scenario() -> list[dict]:
+        read_started = asyncio.Event()
+        write_done = asyncio.Event()
+
+        @cached("test", lambda **_: "key")
+        async def slow_read():
+            value = state["value"]
+            read_started.set()
+            await write_done.wait()
+            return {"value": value}
+
+        racing = asyncio.create_task(slow_read())
+        await read_started.wait()
+        # the write commits and invalidates while the read is still running
+        state["value"] = 2
+        await ResponseCache.invalidate("test")
+        write_done.set()
+
+        responses = [await racing, await slow_read()]
+        return [{"body": r.body, "cache": r.headers["x-cache"]} for r in responses]
+
+    racing, after = asyncio.run(scenario())
+    assert racing == {"body": b'{"value":1}', "cache": "MISS"}
+    assert after == {"body": b'{"value":2}', "cache": "MISS"}